@@ -1,8 +1,52 @@
+import copy
+import functools
 import json
+import mmap
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data: Any) -> Any:
+    """Parse JSON bytes (or a bytes-like buffer) with orjson when available, else the stdlib."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to indented JSON bytes with orjson when available, else the stdlib."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Read and parse a config file; cached on (path, mtime, size).
+
+    Callers must copy the result before mutating it.
+    """
+    if size == 0:
+        return _loads(b'')
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            # Ask the kernel to read ahead the whole mapping up front.
+            for advice in ('MADV_WILLNEED', 'MADV_SEQUENTIAL'):
+                if hasattr(mmap, advice):
+                    mm.madvise(getattr(mmap, advice))
+            with memoryview(mm) as view:
+                return _loads(view)
+    finally:
+        os.close(fd)
+
 class UXTConfig:
     """Configuration management for UXT."""
     
@@ -39,9 +83,10 @@ class UXTConfig:
         """Load configuration from file."""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    file_config = json.load(f)
-                    self._config.update(file_config)
+                st = os.stat(self.config_file)
+                file_config = _parse_config(self.config_file, st.st_mtime_ns, st.st_size)
+                self._config.update(copy.deepcopy(file_config))
+                self._invalidate_derived()
                 return True
         except Exception as e:
             print(f"Warning: Failed to load config from {self.config_file}: {e}")
@@ -51,8 +96,9 @@ class UXTConfig:
         """Save configuration to file."""
         try:
             os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=2)
+            data = _dumps(self._config)
+            with open(self.config_file, 'wb') as f:
+                f.write(data)
             return True
         except Exception as e:
             print(f"Error: Failed to save config to {self.config_file}: {e}")
@@ -65,12 +111,29 @@ class UXTConfig:
     def set(self, key: str, value: Any) -> None:
         """Set configuration value."""
         self._config[key] = value
+        self._invalidate_derived()
     
     def reset(self) -> bool:
         """Reset configuration to defaults."""
         self._config = self._load_default_config()
+        self._invalidate_derived()
         return self.save()
     
     def get_all(self) -> Dict[str, Any]:
         """Get all configuration values."""
         return self._config.copy()
+    
+    @cached_property
+    def ignore_dirs_set(self) -> frozenset:
+        """Ignored directory names as a frozenset for O(1) membership checks."""
+        return frozenset(self._config.get('ignore_dirs', []))
+    
+    @cached_property
+    def code_extensions_set(self) -> frozenset:
+        """Scanned file extensions as a frozenset for O(1) membership checks."""
+        return frozenset(self._config.get('code_extensions', []))
+    
+    def _invalidate_derived(self) -> None:
+        """Drop cached values derived from the config dict."""
+        self.__dict__.pop('ignore_dirs_set', None)
+        self.__dict__.pop('code_extensions_set', None)
@@ -11,6 +11,7 @@ def create_config_py():
     """Create config.py with UXTConfig class."""
     config_content = '''import json
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -51,6 +52,7 @@ class UXTConfig:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     file_config = json.load(f)
                     self._config.update(file_config)
+                self._invalidate_derived()
                 return True
         except Exception:
             pass
@@ -70,13 +72,27 @@ class UXTConfig:
     
     def set(self, key: str, value: Any) -> None:
         self._config[key] = value
+        self._invalidate_derived()
     
     def reset(self) -> bool:
         self._config = self._load_default_config()
+        self._invalidate_derived()
         return self.save()
     
     def get_all(self) -> Dict[str, Any]:
         return self._config.copy()
+    
+    @cached_property
+    def ignore_dirs_set(self) -> frozenset:
+        return frozenset(self._config.get('ignore_dirs', []))
+    
+    @cached_property
+    def code_extensions_set(self) -> frozenset:
+        return frozenset(self._config.get('code_extensions', []))
+    
+    def _invalidate_derived(self) -> None:
+        self.__dict__.pop('ignore_dirs_set', None)
+        self.__dict__.pop('code_extensions_set', None)
 '''
     
     config_path = Path("config.py")
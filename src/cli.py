@@ -1,18 +1,28 @@
 import sys
 import os
-import difflib
+import string
+import hashlib
+import pickle
+import queue
+import re
 import threading
 import time
-import itertools
 import logging
 from pathlib import Path
-from typing import Dict, Set, Optional, Tuple
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Set, Optional, Tuple
 from datetime import datetime
+from functools import cached_property
 
-from outline import OutlineNode, save_outline_to_file, load_outline_from_file
-from ollama import OllamaClient
+from colorama import Fore, Style
+
+from outline import OutlineNode, load_outline_from_file, append_outline_mutation, compact_outline
 from editor import apply_edit, run_shell_command, sanitize_code_content
-from utils import user_confirm, print_yellow, draw_box, color_diff
+from utils import user_confirm, draw_box, color_diff, emit, encode_output, unified_diff_lines, init_colorama_safe
+
+if TYPE_CHECKING:
+    # Imported in main_loop so startup doesn't pay for requests
+    from ollama import OllamaClient
 
 # Import config with explicit path handling to avoid conflicts
 try:
@@ -55,12 +65,22 @@ except ImportError:
             
             def set(self, key, value):
                 self._config[key] = value
+                self.__dict__.pop('ignore_dirs_set', None)
+                self.__dict__.pop('code_extensions_set', None)
             
             def save(self):
                 return True
             
             def reset(self):
                 return True
+            
+            @cached_property
+            def ignore_dirs_set(self):
+                return frozenset(self._config.get('ignore_dirs', []))
+            
+            @cached_property
+            def code_extensions_set(self):
+                return frozenset(self._config.get('code_extensions', []))
 
 LOGO = r"""
 ██╗      ██╗   ██╗██╗  ██╗████████╗
@@ -71,121 +91,407 @@ LOGO = r"""
 ╚═╝       ╚═════╝ ╚═╝  ╚═╝   ╚═╝
 """
 
+PROMPT_TEMPLATE = string.Template("""You are an agentic coding assistant.
+
+You are working on the following tasks:
+$outline_context
+
+The user said:
+\"\"\"$user_input\"\"\"
+
+Respond with one of the following formats:
+
+If this requires code changes:
+Edit: ./relative/path/to/file.ext
+<new full file content here>
+
+If this requires running shell commands:
+Run: <command>
+
+If this request can be broken down into subtasks:
+Outline:
+- Task 1
+- Task 2
+
+Do not explain anything unless asked.
+Only respond with a single Edit, Run, or Outline section.
+
+Never delete or modify user code unless the user's prompt explicitly requests it or clearly implies it.""")
+
+LOGO_BYTES = encode_output(Fore.YELLOW + LOGO + Style.RESET_ALL + "\n")
+
+# Matches an Edit:/Run:/Outline: directive at the start of a line
+DIRECTIVE_RE = re.compile(r"^(edit|run|outline):[ \t]*(.*)$", re.IGNORECASE | re.MULTILINE)
+
+# Shell commands that warrant an extra confirmation before running
+_DANGEROUS_RE = re.compile(r"rm\s+-rf|del\s+/s|format|mkfs|dd\s+if=", re.IGNORECASE)
+
+# Combined old+new line count above which the edit diff runs behind a spinner
+LARGE_DIFF_LINES = 2000
+
 UXT_HOME = Path.home() / ".uxt"
 DATA_PATH = UXT_HOME / "tasks.json"
+CACHE_DIR = UXT_HOME / "cache"
 
 # Global config instance
 config = UXTConfig()
 
+def _read_file(filepath: str) -> Optional[str]:
+    """Read a file as text, returning None if it cannot be read."""
+    try:
+        # Unbuffered binary read sizes the buffer from fstat, then one decode pass
+        with open(filepath, "rb", buffering=0) as f:
+            data = f.read()
+        return data.decode("utf-8", errors="ignore")
+    except Exception as e:
+        logging.debug(f"Failed to read {filepath}: {e}")
+        return None
+
 class CodebaseCache:
-    """Caches file contents and modification times to avoid unnecessary re-reads."""
+    """Caches file contents and modification times to avoid unnecessary re-reads.
     
-    def __init__(self):
-        self.cache: Dict[str, str] = {}
+    Holds at most ``max_entries`` files, evicting the least recently used.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        self.cache: "OrderedDict[str, str]" = OrderedDict()
         self.mtimes: Dict[str, float] = {}
+        self.max_entries = max_entries
+        self.dirty = False
+        # The background scan and the main thread may both write to the cache
+        self._lock = threading.Lock()
+        # Last file index and the directory mtimes it was built from
+        self.index: Optional[List[str]] = None
+        self.index_key: Optional[tuple] = None
+        self.index_dirs: Dict[str, int] = {}
         
-    def is_stale(self, filepath: str) -> bool:
-        """Check if cached file is stale based on modification time."""
-        try:
-            current_mtime = os.path.getmtime(filepath)
-            return filepath not in self.mtimes or self.mtimes[filepath] != current_mtime
-        except OSError:
-            return True
+    def is_stale(self, filepath: str, current_mtime: Optional[float] = None) -> bool:
+        """Check if cached file is stale based on modification time.
+        
+        Pass current_mtime when the caller already has a stat result to avoid
+        another stat() syscall.
+        """
+        if current_mtime is None:
+            try:
+                current_mtime = os.path.getmtime(filepath)
+            except OSError:
+                return True
+        return filepath not in self.mtimes or self.mtimes[filepath] != current_mtime
             
-    def update(self, filepath: str, content: str):
+    def update(self, filepath: str, content: str, mtime: Optional[float] = None):
         """Update cache with new content and mtime."""
-        self.cache[filepath] = content
-        try:
-            self.mtimes[filepath] = os.path.getmtime(filepath)
-        except OSError:
-            pass
+        if mtime is None:
+            try:
+                mtime = os.path.getmtime(filepath)
+            except OSError:
+                pass
+        with self._lock:
+            self.cache[filepath] = content
+            self.cache.move_to_end(filepath)
+            self.dirty = True
+            if mtime is not None:
+                self.mtimes[filepath] = mtime
+            while len(self.cache) > self.max_entries:
+                evicted, _ = self.cache.popitem(last=False)
+                self.mtimes.pop(evicted, None)
             
-    def get(self, filepath: str) -> Optional[str]:
+    def get(self, filepath: str, mtime: Optional[float] = None) -> Optional[str]:
         """Get cached content if not stale."""
-        if not self.is_stale(filepath):
-            return self.cache.get(filepath)
+        if filepath in self.cache and not self.is_stale(filepath, mtime):
+            self.cache.move_to_end(filepath)
+            return self.cache[filepath]
         return None
+    
+    def read(self, filepath: str) -> Optional[str]:
+        """Get file content, reading from disk only if the cached copy is missing or stale."""
+        # One stat serves both the staleness check and the cache update
+        try:
+            mtime = os.path.getmtime(filepath)
+        except OSError:
+            return None
+        content = self.get(filepath, mtime)
+        if content is None:
+            content = _read_file(filepath)
+            if content is not None:
+                self.update(filepath, content, mtime)
+        return content
+    
+    def cached_index(self, key: tuple) -> Optional[List[str]]:
+        """Return the last file index if it was built with the same filters and no directory changed.
+        
+        Adding, removing or renaming a file bumps its parent directory's mtime,
+        so stat-ing the directories is enough to validate the file list.
+        """
+        with self._lock:
+            index, index_key, index_dirs = self.index, self.index_key, self.index_dirs
+        if index is None or key != index_key:
+            return None
+        for dirpath, mtime_ns in index_dirs.items():
+            try:
+                if os.stat(dirpath).st_mtime_ns != mtime_ns:
+                    return None
+            except OSError:
+                return None
+        return index
+    
+    def store_index(self, key: tuple, index: List[str], dir_mtimes: Dict[str, int]):
+        """Remember a freshly built file index for cached_index."""
+        with self._lock:
+            self.index = index
+            self.index_key = key
+            self.index_dirs = dir_mtimes
+            self.dirty = True
+    
+    @staticmethod
+    def snapshot_path(root_dir: str = ".") -> Path:
+        """Location of the on-disk cache for a given project directory."""
+        key = hashlib.blake2b(os.path.abspath(root_dir).encode("utf-8"), digest_size=8).hexdigest()
+        return CACHE_DIR / f"codebase-{key}.pickle"
+    
+    def load(self, path: Path) -> bool:
+        """Restore cached contents, mtimes and the file index persisted by a previous session.
+        
+        The index is revalidated against directory mtimes by cached_index, so an
+        unchanged tree skips the startup walk entirely.
+        """
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+            self.cache = OrderedDict(data["cache"])
+            self.mtimes = data["mtimes"]
+            self.index = data.get("index")
+            self.index_key = data.get("index_key")
+            self.index_dirs = data.get("index_dirs", {})
+            self.dirty = False
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logging.debug(f"Failed to load codebase cache from {path}: {e}")
+            return False
+    
+    def save(self, path: Path) -> bool:
+        """Persist cached contents, mtimes and the file index for the next session."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with self._lock:
+                payload = pickle.dumps({
+                    "cache": self.cache,
+                    "mtimes": self.mtimes,
+                    "index": self.index,
+                    "index_key": self.index_key,
+                    "index_dirs": self.index_dirs,
+                }, protocol=pickle.HIGHEST_PROTOCOL)
+                self.dirty = False
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logging.debug(f"Failed to save codebase cache to {path}: {e}")
+            return False
 
 def print_outline(node: OutlineNode, prefix=""):
-    print(prefix + "- " + node.title)
-    for child in node.children:
-        print_outline(child, prefix + "  ")
+    """Print the outline tree with a single write to stdout."""
+    buf = []
+    stack = [(node, prefix)]
+    while stack:
+        current, indent = stack.pop()
+        buf.append(indent + "- " + current.title)
+        child_indent = indent + "  "
+        stack.extend((child, child_indent) for child in reversed(current.children))
+    buf.append("")
+    sys.stdout.write("\n".join(buf))
 
 def gather_outline_text(node: OutlineNode, indent=0):
-    spacer = "  " * indent
-    text = f"{spacer}- {node.title}\n"
-    for child in node.children:
-        text += gather_outline_text(child, indent + 1)
-    return text
-
-def should_scan_file(path: Path) -> bool:
-    """Determine if a file should be included in the codebase scan."""
-    code_extensions = set(config.get('code_extensions', []))
+    """Render the outline as an indented bullet list (iterative, joined once)."""
+    buf = []
+    spacers = {}
+    stack = [(node, indent)]
+    while stack:
+        current, depth = stack.pop()
+        spacer = spacers.get(depth)
+        if spacer is None:
+            spacer = spacers[depth] = "  " * depth
+        buf.append(spacer)
+        buf.append("- ")
+        buf.append(current.title)
+        buf.append("\n")
+        stack.extend((child, depth + 1) for child in reversed(current.children))
+    return "".join(buf)
+
+def _iter_code_files(root_dir: str, code_extensions: Tuple[str, ...], ignore_dirs: frozenset, max_file_size: int,
+                     dir_mtimes: Optional[Dict[str, int]] = None):
+    """Yield (filepath, stat) for code files under root_dir that pass the scan filters.
+    
+    Uses os.scandir so directory type checks come from the cached DirEntry,
+    pruning ignored directories before descending into them. The filters are
+    passed in so callers resolve them from config once per scan; code_extensions
+    is a tuple of lowercase suffixes for str.endswith. If dir_mtimes
+    is given, it is filled with the mtime of every directory visited.
+    """
+    base = os.path.normpath(root_dir)
+    if dir_mtimes is not None:
+        try:
+            dir_mtimes[root_dir] = os.stat(root_dir).st_mtime_ns
+        except OSError:
+            pass
+    stack = [(root_dir, "" if base == os.curdir else base + os.sep)]
+    while stack:
+        dirpath, prefix = stack.pop()
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in ignore_dirs:
+                                subdir = prefix + entry.name
+                                if dir_mtimes is not None:
+                                    dir_mtimes[subdir] = entry.stat(follow_symlinks=False).st_mtime_ns
+                                stack.append((subdir, subdir + os.sep))
+                            continue
+                        # Check the extension before paying for a stat(); names are
+                        # usually lowercase already, so only lower() on a miss
+                        name = entry.name
+                        if not name.endswith(code_extensions) and not name.lower().endswith(code_extensions):
+                            continue
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                        # Skip files that are too large
+                        if st.st_size > max_file_size:
+                            continue
+                        yield prefix + entry.name, st
+                    except OSError:
+                        continue
+        except OSError as e:
+            logging.debug(f"Failed to scan {dirpath}: {e}")
+
+def scan_codebase(root_dir=".", progress: Optional[queue.SimpleQueue] = None,
+                  cache: Optional[CodebaseCache] = None) -> List[str]:
+    """Index code files under root_dir without reading them.
+    
+    Contents are loaded on demand through CodebaseCache.read. If a progress
+    queue is given, the running file count is put on it every 64 files. With
+    a cache, the previous index is reused while no directory has changed.
+    """
+    # Resolve filters from config once for the whole scan
+    code_extensions = config.code_extensions_set
+    ignore_dirs = config.ignore_dirs_set
     max_file_size = config.get('max_file_size', 1024 * 1024)
-    ignore_dirs = set(config.get('ignore_dirs', []))
     
-    if path.suffix.lower() not in code_extensions:
-        return False
-        
-    # Skip files that are too large
-    try:
-        if path.stat().st_size > max_file_size:
-            return False
-    except OSError:
-        return False
-        
-    # Skip files in ignored directories
-    for part in path.parts:
-        if part in ignore_dirs:
-            return False
-            
-    return True
+    index_key = (os.path.abspath(root_dir), code_extensions, ignore_dirs, max_file_size)
+    if cache is not None:
+        file_index = cache.cached_index(index_key)
+        if file_index is not None:
+            logging.debug("Directory tree unchanged, reusing file index")
+            return file_index
+    
+    file_index = []
+    dir_mtimes = {} if cache is not None else None
+    
+    code_suffixes = tuple(sorted({ext.lower() for ext in code_extensions}))
+    for filepath, st in _iter_code_files(root_dir, code_suffixes, ignore_dirs, max_file_size, dir_mtimes):
+        file_index.append(filepath)
+        if progress is not None and len(file_index) % 64 == 0:
+            progress.put(len(file_index))
+    
+    # Debug only: this runs on the prefetch thread while the prompt is showing
+    logging.debug(f"Indexed {len(file_index)} files")
+    
+    if cache is not None:
+        cache.store_index(index_key, file_index, dir_mtimes)
+    
+    return file_index
 
-def scan_codebase(root_dir=".", cache: Optional[CodebaseCache] = None) -> Dict[str, str]:
-    """Efficiently scan codebase with caching and filtering."""
-    file_map = {}
-    scanned_count = 0
-    cached_count = 0
+class StopFlag:
+    """Lock-free stop signal for the spinner thread.
     
-    if cache is None:
-        cache = CodebaseCache()
+    A plain attribute store/load is atomic under the GIL and on free-threaded
+    builds, so a threading.Event's condition lock is unnecessary here.
+    """
+    __slots__ = ("stop",)
     
-    for path in Path(root_dir).rglob("*"):
-        if not path.is_file() or not should_scan_file(path):
-            continue
-            
-        filepath = str(path)
-        
-        # Try to get from cache first
-        cached_content = cache.get(filepath)
-        if cached_content is not None:
-            file_map[filepath] = cached_content
-            cached_count += 1
+    def __init__(self):
+        self.stop = False
+
+def show_spinner(stop_flag: StopFlag, message="Scanning codebase", progress: Optional[queue.SimpleQueue] = None):
+    """Show a spinner with customizable message.
+    
+    With a progress queue, frames are driven by the file counts the worker
+    puts on it rather than a fixed 10Hz timer; put None to wake it for exit.
+    """
+    import itertools
+    
+    # Encode each frame once; only the progress suffix changes between writes
+    frames = itertools.cycle([encode_output(f"\r[uxt] {message}... {c}") for c in "⠋⠙⠸⠴⠦⠇"])
+    status = b""
+    while not stop_flag.stop:
+        emit(next(frames) + status)
+        if progress is None:
+            time.sleep(0.1)
             continue
-            
-        # Read file and update cache
         try:
-            content = path.read_text(encoding="utf-8", errors="ignore")
-            file_map[filepath] = content
-            cache.update(filepath, content)
-            scanned_count += 1
-        except Exception as e:
-            logging.debug(f"Failed to read {filepath}: {e}")
+            count = progress.get(timeout=0.25)
+        except queue.Empty:
             continue
+        if count is not None:
+            status = f" ({count} files)".encode()
+    emit(encode_output(f"\r[uxt] {message} complete.         \n"))
+
+def run_with_spinner(func, message: str):
+    """Run func on a worker thread while showing a spinner, and return its result."""
+    from concurrent.futures import ThreadPoolExecutor
     
-    if scanned_count > 0 or cached_count > 0:
-        logging.info(f"Scanned {scanned_count} files, used {cached_count} from cache")
+    stop_spinner = StopFlag()
+    spinner_thread = threading.Thread(target=show_spinner, args=(stop_spinner, message))
+    spinner_thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(func).result()
+    finally:
+        stop_spinner.stop = True
+        spinner_thread.join()
+
+def stream_response(client: "OllamaClient", prompt: str) -> str:
+    """Echo the AI response as it streams in and return the full text.
     
-    return file_map
-
-def show_spinner(stop_event, message="Scanning codebase"):
-    """Show a spinner with customizable message."""
-    spinner = itertools.cycle(["⠋", "⠙", "⠸", "⠴", "⠦", "⠇"])
-    while not stop_event.is_set():
-        sys.stdout.write(f"\r[uxt] {message}... {next(spinner)}")
-        sys.stdout.flush()
-        time.sleep(0.1)
-    sys.stdout.write(f"\r[uxt] {message} complete.         \n")
+    Output is only held back while it could still start with an Edit
+    directive; Edit bodies are not echoed since the diff preview shows them.
+    """
+    chunks = []
+    head = ""  # start of the response, held back until it can't be an Edit directive
+    holding = True
+    echo = True
+    
+    print("[uxt] Ollama response:")
+    for chunk in client.chat_stream(prompt):
+        chunks.append(chunk)
+        if holding:
+            head += chunk if head else chunk.lstrip()
+            if head[:5].lower() == "edit:":
+                # Wait for the full directive line, then suppress the body
+                if "\n" not in chunk:
+                    continue
+                holding = False
+                echo = False
+                directive = DIRECTIVE_RE.match(head)
+                sys.stdout.write(directive.group(0) + "\n[uxt] Receiving file content...")
+                sys.stdout.flush()
+                continue
+            if len(head) < 5 and "\n" not in head:
+                continue
+            holding = False
+            chunk = head
+        if echo:
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+    
+    if holding:
+        sys.stdout.write(head)
+    sys.stdout.write("\n")
+    return "".join(chunks)
 
 class ResponseHandler:
     """Handles parsing and execution of AI responses."""
@@ -193,23 +499,26 @@ class ResponseHandler:
     @staticmethod
     def parse_response(response: str) -> Tuple[Optional[str], Optional[dict]]:
         """Parse AI response and return action type and details."""
-        lines = response.strip().splitlines()
+        text = response.strip()
         
-        edit_index = next((i for i, l in enumerate(lines) if l.lower().startswith("edit:")), None)
-        run_index = next((i for i, l in enumerate(lines) if l.lower().startswith("run:")), None)
-        outline_index = next((i for i, l in enumerate(lines) if l.lower().startswith("outline:")), None)
-        
-        if outline_index is not None:
-            tasks = [line.strip("- ").strip() for line in lines if line.startswith("- ")]
+        # The first directive wins; anything after it is that directive's body
+        match = DIRECTIVE_RE.search(text)
+        if match is None:
+            return None, None
+        directive = match.group(1).lower()
+        # Body starts on the line after the directive
+        body = text[match.end() + 1:]
+
+        if directive == "outline":
+            tasks = [line.strip("- ").strip() for line in body.splitlines() if line.startswith("- ")]
             return "outline", {"tasks": tasks}
             
-        elif edit_index is not None:
-            filepath = lines[edit_index][5:].strip()
-            new_content = "\n".join(lines[edit_index + 1:])
-            return "edit", {"filepath": filepath, "content": new_content}
+        elif directive == "edit":
+            filepath = match.group(2).strip()
+            return "edit", {"filepath": filepath, "content": body}
             
-        elif run_index is not None:
-            command = lines[run_index][4:].strip()
+        elif directive == "run":
+            command = match.group(2).strip()
             return "run", {"command": command}
             
         return None, None
@@ -219,12 +528,12 @@ class ResponseHandler:
         """Handle outline creation."""
         for task in tasks:
             outline_root.add_child(OutlineNode(task))
-        save_outline_to_file(outline_root, DATA_PATH)
+            append_outline_mutation(DATA_PATH, {"op": "add_child", "parent": [], "title": task})
         print(f"[uxt] Added {len(tasks)} outlined tasks.")
         return True
     
     @staticmethod
-    def handle_edit(filepath: str, new_content: str) -> bool:
+    def handle_edit(filepath: str, new_content: str, cache: Optional[CodebaseCache] = None) -> bool:
         """Handle file editing with preview and confirmation."""
         new_content = sanitize_code_content(new_content)
         
@@ -234,20 +543,35 @@ class ResponseHandler:
             return False
         
         if os.path.exists(filepath):
-            with open(filepath, "r", encoding="utf-8") as f:
-                old_content = f.read()
+            old_content = (cache.read(filepath) if cache is not None else _read_file(filepath)) or ""
         else:
             old_content = ""
-            
-        diff_text = "\n".join(difflib.unified_diff(
-            old_content.splitlines(),
-            new_content.splitlines(),
-            fromfile=filepath,
-            tofile=f"{filepath} (edited)",
-            lineterm=""
-        ))
         
-        print(draw_box(f"Preview Edit: {filepath}", color_diff(diff_text)))
+        old_lines = old_content.splitlines() if old_content else []
+        new_lines = new_content.splitlines()
+        
+        # A no-op edit needs no diff, backup or confirmation. Compare lines so
+        # the stripped trailing newline of sanitized content doesn't count
+        if old_lines and old_lines == new_lines:
+            print(f"[uxt] No changes to {filepath}.")
+            return False
+        
+        def render_diff() -> str:
+            return color_diff("\n".join(unified_diff_lines(
+                old_lines,
+                new_lines,
+                fromfile=filepath,
+                tofile=f"{filepath} (edited)",
+                algorithm="patience"
+            )))
+        
+        # Large diffs are computed on a worker so the spinner keeps the UI alive
+        if len(old_lines) + len(new_lines) > LARGE_DIFF_LINES:
+            preview = run_with_spinner(render_diff, "Computing diff")
+        else:
+            preview = render_diff()
+        
+        print(draw_box(f"Preview Edit: {filepath}", preview))
         
         if user_confirm(f"Apply edit to {filepath}?"):
             if apply_edit(filepath, new_content):
@@ -264,8 +588,7 @@ class ResponseHandler:
     def handle_run(command: str) -> bool:
         """Handle shell command execution with validation."""
         # Basic validation for dangerous commands
-        dangerous_patterns = ['rm -rf', 'del /s', 'format', 'mkfs', 'dd if=']
-        if any(pattern in command.lower() for pattern in dangerous_patterns):
+        if _DANGEROUS_RE.search(command):
             print("[uxt] Warning: Potentially dangerous command detected!")
             if not user_confirm("This command could be destructive. Continue anyway?"):
                 return False
@@ -275,31 +598,32 @@ class ResponseHandler:
             return run_shell_command(command)
         return False
 
-def display_scan_results(codebase: Dict[str, str]):
+def display_scan_results(codebase: List[str]):
     """Display codebase scan results in a user-friendly format."""
     max_display_files = config.get('max_display_files', 20)
     total_files = len(codebase)
-    print(f"[uxt] Scanned {total_files} code files:")
+    # Collect every line and print once rather than one write per file
+    lines = [f"[uxt] Scanned {total_files} code files:"]
     
-    # Group files by extension for better overview
+    # Count files by extension for better overview
     by_extension = {}
-    for filepath in codebase.keys():
-        ext = Path(filepath).suffix.lower()
-        by_extension.setdefault(ext, []).append(filepath)
+    for filepath in codebase:
+        ext = os.path.splitext(filepath)[1].lower()
+        by_extension[ext] = by_extension.get(ext, 0) + 1
     
     # Show overview by file type
     if len(by_extension) > 1:
-        for ext, files in sorted(by_extension.items()):
-            print(f"  {ext or '(no ext)'}: {len(files)} files")
-        print()
+        for ext, count in sorted(by_extension.items()):
+            lines.append(f"  {ext or '(no ext)'}: {count} files")
+        lines.append("")
     
     # Show individual files (up to limit)
-    displayed_files = list(codebase.keys())[:max_display_files]
-    for filepath in displayed_files:
-        print(f"  - {filepath}")
+    lines.extend(f"  - {filepath}" for filepath in codebase[:max_display_files])
     
     if total_files > max_display_files:
-        print(f"  ... and {total_files - max_display_files} more")
+        lines.append(f"  ... and {total_files - max_display_files} more")
+    
+    print("\n".join(lines))
 
 def get_user_input() -> str:
     """Get user input with basic command handling."""
@@ -381,7 +705,8 @@ You can also ask the AI to:
     print(draw_box("Help", help_text.strip()))
 def main_loop():
     """Main application loop with improved error handling and caching."""
-    print_yellow(LOGO)
+    init_colorama_safe()
+    emit(LOGO_BYTES)
 
     # Setup logging
     logging.basicConfig(
@@ -399,10 +724,15 @@ def main_loop():
     # Initialize components
     outline_root = load_outline_from_file(DATA_PATH)
     cache = CodebaseCache()
+    cache_path = CodebaseCache.snapshot_path()
+    if config.get('enable_caching', True):
+        cache.load(cache_path)
     response_handler = ResponseHandler()
+    outline_version, outline_context = None, ""
     
     # Initialize AI client with error handling
     try:
+        from ollama import OllamaClient
         client = OllamaClient(
             host=config.get('ollama_host', 'http://localhost'),
             port=config.get('ollama_port', 11434),
@@ -413,73 +743,71 @@ def main_loop():
         print("[uxt] Please ensure Ollama is running and try again.")
         return
 
+    # Warm the HTTP connection in the background while the first scan runs
+    threading.Thread(target=client.warmup, daemon=True).start()
+
+    # The next scan runs here while the user is reading and typing
+    from concurrent.futures import ThreadPoolExecutor
+    scan_executor = ThreadPoolExecutor(max_workers=1)
+    scan_future, scan_progress = None, None
+
     print("[uxt] Type 'help' for available commands.")
 
     while True:
         try:
-            # Scan codebase with caching
             use_cache = config.get('enable_caching', True)
-            if use_cache:
-                stop_spinner = threading.Event()
-                spinner_thread = threading.Thread(target=show_spinner, args=(stop_spinner, "Scanning codebase"))
-                spinner_thread.start()
-
-                codebase = scan_codebase(cache=cache)
-
-                stop_spinner.set()
-                spinner_thread.join()
-            else:
-                codebase = scan_codebase()
-
-            # Display results
-            display_scan_results(codebase)
-
+            if scan_future is None:
+                scan_progress = queue.SimpleQueue()
+                scan_future = scan_executor.submit(scan_codebase, progress=scan_progress,
+                                                   cache=cache if use_cache else None)
+            
             print("\nCurrent Tasks:")
             print_outline(outline_root)
             
-            # Get user input
+            # Get user input first; local commands don't need a scan
             user_input = get_user_input()
             if not user_input:
                 continue
                 
             if user_input.lower() in ("quit", "exit", "q"):
-                save_outline_to_file(outline_root, DATA_PATH)
+                scan_executor.shutdown(wait=False)
+                compact_outline(outline_root, DATA_PATH)
                 print("Goodbye!")
                 break
 
-            # Prepare AI prompt
-            outline_context = gather_outline_text(outline_root)
-            prompt = f"""You are an agentic coding assistant.
-
-You are working on the following tasks:
-{outline_context}
-
-The user said:
-\"\"\"{user_input}\"\"\"
-
-Respond with one of the following formats:
-
-If this requires code changes:
-Edit: ./relative/path/to/file.ext
-<new full file content here>
+            # Collect the prefetched index; file contents are read on demand
+            pending, scan_future = scan_future, None
+            if not pending.done():
+                stop_spinner = StopFlag()
+                spinner_thread = threading.Thread(target=show_spinner, args=(stop_spinner, "Scanning codebase", scan_progress))
+                spinner_thread.start()
+                try:
+                    pending.result()
+                finally:
+                    stop_spinner.stop = True
+                    scan_progress.put(None)
+                    spinner_thread.join()
+            codebase = pending.result()
+            if use_cache:
+                # Revalidate against changes made while the user was typing;
+                # this only stats directories unless one of them changed
+                codebase = scan_codebase(cache=cache)
 
-If this requires running shell commands:
-Run: <command>
+            if use_cache and cache.dirty:
+                cache.save(cache_path)
 
-If this request can be broken down into subtasks:
-Outline:
-- Task 1
-- Task 2
-
-Do not explain anything unless asked.
-Only respond with a single Edit, Run, or Outline section.
+            # Display results
+            display_scan_results(codebase)
 
-Never delete or modify user code unless the user's prompt explicitly requests it or clearly implies it."""
+            # Prepare AI prompt
+            if outline_root.version != outline_version:
+                outline_version = outline_root.version
+                outline_context = gather_outline_text(outline_root)
+            prompt = PROMPT_TEMPLATE.substitute(outline_context=outline_context, user_input=user_input)
 
             # Get AI response
             try:
-                response = client.chat(prompt)
-                print(draw_box("uxt - Ollama response", response))
+                response = stream_response(client, prompt)
             except Exception as e:
                 print(f"[uxt] Error getting AI response: {e}")
                 continue
@@ -490,7 +818,8 @@ Never delete or modify user code unless the user's prompt explicitly requests it
             if action_type == "outline":
                 response_handler.handle_outline(outline_root, details["tasks"])
             elif action_type == "edit":
-                response_handler.handle_edit(details["filepath"], details["content"])
+                response_handler.handle_edit(details["filepath"], details["content"],
+                                             cache if use_cache else None)
             elif action_type == "run":
                 response_handler.handle_run(details["command"])
             else:
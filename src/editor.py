@@ -3,6 +3,9 @@ import shutil
 import subprocess
 import re
 
+# Markdown code fences like ```jsx / ```py and closing ```
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\n|```$", re.MULTILINE)
+
 def backup_file(filepath: str):
     backup_path = f"{filepath}.bak"
     try:
@@ -16,9 +19,9 @@ def sanitize_code_content(content: str) -> str:
     Remove Markdown code fences like ```jsx, ```typescript, ```py etc.
     Keeps only the raw code inside.
     """
-    pattern = r"^```[a-zA-Z]*\n|```$"
-    sanitized = re.sub(pattern, "", content, flags=re.MULTILINE)
-    return sanitized.strip()
+    if "```" not in content:
+        return content.strip()
+    return _FENCE_RE.sub("", content).strip()
 
 def apply_edit(filepath: str, new_content: str):
     if not os.path.exists(filepath):
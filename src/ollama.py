@@ -1,18 +1,42 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import colorama
 import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 class OllamaClient:
     def __init__(self, host="http://localhost", port=11434, model=None):
         self.base_url = f"{host}:{port}"
+        # Reused across requests so the TCP connection stays alive
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.model = model or self._get_model()
 
+    def warmup(self) -> bool:
+        """Open a pooled connection to Ollama ahead of the first chat request."""
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+            return response.status_code == 200
+        except Exception:
+            return False
+
     def test_connection(self) -> bool:
         """Test if Ollama is running and accessible."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except Exception:
             return False
@@ -88,9 +112,9 @@ class OllamaClient:
     def _list_models(self) -> list:
         """Get list of available models from Ollama."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = _loads(response.content)
             return [model['name'] for model in data.get('models', [])]
         except Exception:
             return []
@@ -98,45 +122,62 @@ class OllamaClient:
     def get_model_info(self) -> dict:
         """Get information about the current model."""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/show",
                 json={"name": self.model},
                 timeout=10
             )
             if response.status_code == 200:
-                return response.json()
+                return _loads(response.content)
         except Exception:
             pass
         return {}
 
+    def _format_error(self, error: Exception) -> str:
+        """Turn a failed Ollama request into a user-facing error message."""
+        if isinstance(error, requests.exceptions.ConnectionError):
+            return "[ERROR] Could not connect to Ollama. Please ensure Ollama is running."
+        if isinstance(error, requests.exceptions.HTTPError):
+            if error.response.status_code == 404:
+                return f"[ERROR] Model '{self.model}' not found. Please install it with: ollama pull {self.model}"
+            elif error.response.status_code == 400:
+                return f"[ERROR] Bad request. Check if model '{self.model}' is valid and properly loaded."
+            return f"[ERROR] Ollama HTTP error ({error.response.status_code}): {error}"
+        return f"[ERROR] Ollama request failed: {error}"
+
     def chat(self, prompt: str) -> str:
-        """Send a chat request to Ollama using the native API format."""
+        """Send a chat request to Ollama using the native API format.
+        
+        The response is streamed and assembled, so long generations are not
+        cut off by the read timeout.
+        """
+        return "".join(self.chat_stream(prompt))
+
+    def chat_stream(self, prompt: str):
+        """Stream a chat response from Ollama, yielding text chunks as they arrive."""
         url = f"{self.base_url}/api/generate"
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False
+            "stream": True
         }
         headers = {"Content-Type": "application/json"}
         
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=60)
-            response.raise_for_status()
-            result = response.json()
-            
-            # Ollama's native response structure
-            return result.get("response", "")
-            
-        except requests.exceptions.ConnectionError:
-            return "[ERROR] Could not connect to Ollama. Please ensure Ollama is running."
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                return f"[ERROR] Model '{self.model}' not found. Please install it with: ollama pull {self.model}"
-            elif e.response.status_code == 400:
-                return f"[ERROR] Bad request. Check if model '{self.model}' is valid and properly loaded."
-            return f"[ERROR] Ollama HTTP error ({e.response.status_code}): {e}"
+            with self.session.post(url, json=payload, headers=headers, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                # Ollama streams one JSON object per line
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    text = chunk.get("response", "")
+                    if text:
+                        yield text
+                    if chunk.get("done"):
+                        break
         except Exception as e:
-            return f"[ERROR] Ollama request failed: {e}"
+            yield self._format_error(e)
 
     def main_loop(self):
         """Main loop to interact with the user and Ollama."""
@@ -173,8 +214,8 @@ RUN: command here
 
 Otherwise, just provide a helpful response."""
             
-            # Get response from Ollama
-            response = self.chat(prompt)
-            
-            # Print and handle the response
-            print(f"Ollama: {response}")
+            # Print the response as it streams in from Ollama
+            print("Ollama: ", end="", flush=True)
+            for chunk in self.chat_stream(prompt):
+                print(chunk, end="", flush=True)
+            print()
@@ -1,39 +1,134 @@
 import json
+import os
 from typing import List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class OutlineNode:
     def __init__(self, title: str, content: str = "", children: Optional[List['OutlineNode']] = None):
         self.title = title
         self.content = content
         self.children = children or []
+        self.parent: Optional['OutlineNode'] = None
+        for child in self.children:
+            child.parent = self
+        # Bumped on every mutation anywhere in the subtree so callers holding
+        # the root can cache derived text.
+        self.version = 0
 
     def add_child(self, node: 'OutlineNode'):
+        node.parent = self
         self.children.append(node)
+        current = self
+        while current is not None:
+            current.version += 1
+            current = current.parent
 
     def to_dict(self):
-        return {
-            "title": self.title,
-            "content": self.content,
-            "children": [child.to_dict() for child in self.children]
-        }
+        # Iterative so deep outlines don't pay per-level frames or hit the recursion limit
+        root = {"title": self.title, "content": self.content, "children": []}
+        stack = [(self, root)]
+        while stack:
+            node, data = stack.pop()
+            for child in node.children:
+                child_data = {"title": child.title, "content": child.content, "children": []}
+                data["children"].append(child_data)
+                stack.append((child, child_data))
+        return root
 
     @staticmethod
     def from_dict(data):
-        children = [OutlineNode.from_dict(child) for child in data.get("children", [])]
-        return OutlineNode(data["title"], data.get("content", ""), children)
+        root = OutlineNode(data["title"], data.get("content", ""))
+        stack = [(data, root)]
+        while stack:
+            node_data, node = stack.pop()
+            for child_data in node_data.get("children", []):
+                child = OutlineNode(child_data["title"], child_data.get("content", ""))
+                child.parent = node
+                node.children.append(child)
+                stack.append((child_data, child))
+        return root
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            # orjson refuses nesting deeper than 255 levels; the stdlib copes
+            pass
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+def _dumps_line(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def _journal_path(filepath: str) -> str:
+    return f"{filepath}.log"
+
+def append_outline_mutation(filepath: str, op: dict):
+    # One line per mutation; the snapshot is only rewritten by compact_outline
+    with open(_journal_path(filepath), "ab") as f:
+        f.write(_dumps_line(op))
+
+def _replay_journal(root: OutlineNode, filepath: str):
+    try:
+        with open(_journal_path(filepath), "rb") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+    for line in lines:
+        try:
+            op = _loads(line)
+        except Exception:
+            # A torn final line from an interrupted write; nothing after it is valid
+            break
+        if op.get("op") != "add_child":
+            continue
+        # Parents are addressed by their child-index path from the root
+        parent = root
+        try:
+            for index in op.get("parent", []):
+                parent = parent.children[index]
+        except IndexError:
+            continue
+        parent.add_child(OutlineNode(op["title"], op.get("content", "")))
+
+def compact_outline(root: OutlineNode, filepath: str):
+    # Fold the journal into a fresh snapshot, then drop it
+    save_outline_to_file(root, filepath)
+    try:
+        os.remove(_journal_path(filepath))
+    except FileNotFoundError:
+        pass
 
 def save_outline_to_file(root: OutlineNode, filepath: str):
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(root.to_dict(), f, indent=2)
+    # Write the whole payload at once to a temp file, then swap it in atomically
+    payload = _dumps(root.to_dict())
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, filepath)
 
 def load_outline_from_file(filepath: str) -> OutlineNode:
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return OutlineNode.from_dict(data)
+        with open(filepath, "rb") as f:
+            data = _loads(f.read())
+            root = OutlineNode.from_dict(data)
     except FileNotFoundError:
-        # Return default root if no file
-        return OutlineNode("Root Task: Start coding session")
+        # Start from the default root if no file
+        root = OutlineNode("Root Task: Start coding session")
     except Exception as e:
         print(f"[ERROR] Failed to load outline from {filepath}: {e}")
         return OutlineNode("Root Task: Start coding session")
+    # Apply mutations recorded since the last compaction
+    _replay_journal(root, filepath)
+    return root
@@ -1,48 +1,387 @@
+import colorama
 from colorama import Fore, Style
-import difflib
+from colorama.ansitowin32 import StreamWrapper
+import bisect
+import functools
+import sys
+
+# The native diff backend is resolved on first use so importing utils stays cheap
+_UNRESOLVED = object()
+_native_diff = _UNRESOLVED
+
+def _native_diff_backend():
+    """Return the difflib_rs module, or None when it isn't installed."""
+    global _native_diff
+    if _native_diff is _UNRESOLVED:
+        try:
+            import difflib_rs
+            _native_diff = difflib_rs
+        except ImportError:
+            _native_diff = None
+    return _native_diff
+
+# colorama codes resolved once; hot paths also bind them as default-arg locals
+_Y, _G, _R, _RESET, _DIM = Fore.YELLOW, Fore.GREEN, Fore.RED, Style.RESET_ALL, Style.DIM
+
+_colorama_ready = False
+
+def init_colorama_safe():
+    """Run colorama.init() at most once; each extra call wraps stdout again."""
+    global _colorama_ready
+    if not _colorama_ready:
+        colorama.init()
+        _colorama_ready = True
+
+STDOUT_ENCODING = getattr(sys.stdout, "encoding", None) or "utf-8"
+# Color escapes only help a terminal; pipes and files get plain text
+_COLOR = hasattr(sys.stdout, "isatty") and sys.stdout.isatty()
+
+def encode_output(text: str) -> bytes:
+    """Pre-encode static text for emit()."""
+    return text.encode(STDOUT_ENCODING, errors="replace")
+
+def emit(data: bytes):
+    """Write pre-encoded bytes straight to stdout's binary buffer.
+    
+    When colorama has wrapped stdout (Windows conversion, or stripping ANSI
+    codes for non-TTY output) the text path is used so the wrapper still
+    sees the escapes.
+    """
+    stdout = sys.stdout
+    buffer = None if isinstance(stdout, StreamWrapper) else getattr(stdout, "buffer", None)
+    if buffer is None:
+        stdout.write(data.decode(STDOUT_ENCODING, errors="replace"))
+        stdout.flush()
+        return
+    # Flush pending text first so output ordering is preserved
+    stdout.flush()
+    buffer.write(data)
+    buffer.flush()
 
 def user_confirm(prompt: str) -> bool:
-    resp = input(f"{prompt} (y/n): ").strip().lower()
-    return resp == "y"
+    # Only the first character decides, so no strip()/lower() copies are made
+    return input(f"{prompt} (y/n): ")[:1] in ("y", "Y")
+
+_Y_B, _RESET_LINE_B = encode_output(_Y), encode_output(_RESET + "\n")
 
 def print_yellow(text: str):
-    print(Fore.YELLOW + text + Style.RESET_ALL)
+    emit(_Y_B + encode_output(text) + _RESET_LINE_B)
+
 
+_BOX_WIDTH = 60
+_BOX_BOTTOM = f"╰{'─' * _BOX_WIDTH}╯"
+
+@functools.lru_cache(maxsize=64)
+def _box_frame(title: str, color: str):
+    """Top border, line prefix and bottom border for a box; titles and colors repeat."""
+    top = f"{color}╭─ {title} {'─' * (_BOX_WIDTH - len(title) - 3)}╮"
+    return top, f"{color}│ {_RESET}", f"{color}{_BOX_BOTTOM}{_RESET}"
 
 def draw_box(title: str, content: str, color=Fore.MAGENTA):
-    width = 60
-    top = f"{color}╭─ {title} {'─' * (width - len(title) - 3)}╮"
-    body = "\n".join([f"{color}│ {Style.RESET_ALL}{line}" for line in content.strip().splitlines()])
-    bottom = f"{color}╰{'─' * (width)}╯{Style.RESET_ALL}"
+    top, prefix, bottom = _box_frame(title, color)
+    # Join with the border prefix rather than formatting every line
+    lines = content.strip().splitlines()
+    body = prefix + ("\n" + prefix).join(lines) if lines else ""
     return f"{top}\n{body}\n{bottom}"
 
+# Unified diff lines are classified by their first character
+_DIFF_COLORS = {"+": _G, "-": _R, "@": _Y}
+_DIFF_HEADERS = ("+++", "---")
+
 def color_diff(diff_text: str) -> str:
-    lines = diff_text.splitlines()
-    colored = []
-    for line in lines:
-        if line.startswith("+") and not line.startswith("+++"):
-            colored.append(Fore.GREEN + line + Style.RESET_ALL)
-        elif line.startswith("-") and not line.startswith("---"):
-            colored.append(Fore.RED + line + Style.RESET_ALL)
-        elif line.startswith("@@"):
-            colored.append(Fore.YELLOW + line + Style.RESET_ALL)
+    # Colors stay per line: draw_box resets the style after each border, so a
+    # color shared by a block of lines would only reach its first line.
+    reset, dim = _RESET, _DIM
+    colors, headers = _DIFF_COLORS, _DIFF_HEADERS
+    return "\n".join([
+        f"{dim if line[:3] in headers else colors.get(line[:1], dim)}{line}{reset}"
+        for line in diff_text.splitlines()
+    ])
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a hunk range the way difflib.unified_diff does."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+def _grouped_opcodes(a, b, n):
+    """get_grouped_opcodes for a and b, matching only the region that differs.
+    
+    Edits usually touch a small part of a large file, so the common prefix and
+    suffix are skipped with plain comparisons and only the middle (plus n lines
+    of context) goes through SequenceMatcher. Its autojunk heuristic stays on:
+    without it, scattered edits in files full of repeated lines go quadratic.
+    """
+    lo, hi_a, hi_b = 0, len(a), len(b)
+    limit = min(hi_a, hi_b)
+    while lo < limit and a[lo] == b[lo]:
+        lo += 1
+    while hi_a > lo and hi_b > lo and a[hi_a - 1] == b[hi_b - 1]:
+        hi_a -= 1
+        hi_b -= 1
+    if lo == hi_a and lo == hi_b:
+        return
+    start = max(0, lo - n)
+    tail = min(n, len(a) - hi_a)
+    import difflib
+    matcher = difflib.SequenceMatcher(None, a[start:hi_a + tail], b[start:hi_b + tail])
+    for group in matcher.get_grouped_opcodes(n):
+        yield [(tag, i1 + start, i2 + start, j1 + start, j2 + start) for tag, i1, i2, j1, j2 in group]
+
+def _unique_lcs(a, alo, ahi, b, blo, bhi):
+    """Longest increasing run of lines that occur exactly once in both ranges."""
+    unique_a, unique_b = {}, {}
+    for i in range(alo, ahi):
+        line = a[i]
+        unique_a[line] = -1 if line in unique_a else i
+    for j in range(blo, bhi):
+        line = b[j]
+        unique_b[line] = -1 if line in unique_b else j
+    # Insertion order keeps these sorted by their index in a
+    pairs = [(i, unique_b.get(line, -1)) for line, i in unique_a.items() if i >= 0]
+    pairs = [pair for pair in pairs if pair[1] >= 0]
+    # Patience sorting over the b indices, with back pointers to rebuild the run
+    tops, top_index, back = [], [], [None] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        pile = bisect.bisect_left(tops, j)
+        if pile == len(tops):
+            tops.append(j)
+            top_index.append(k)
         else:
-            colored.append(Style.DIM + line + Style.RESET_ALL)
-    return "\n".join(colored)
+            tops[pile] = j
+            top_index[pile] = k
+        back[k] = top_index[pile - 1] if pile else None
+    run = []
+    k = top_index[-1] if top_index else None
+    while k is not None:
+        run.append(pairs[k])
+        k = back[k]
+    run.reverse()
+    return run
+
+def _patience_opcodes(a, b):
+    """get_opcodes equivalent using patience diff.
+    
+    Lines unique to both sides anchor the alignment, so repeated blank lines
+    and braces can't pull matches out of place; regions without anchors fall
+    back to SequenceMatcher with its default junk heuristic, which keeps
+    large repetitive regions from going quadratic.
+    """
+    matches = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            matches.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
+        anchors = _unique_lcs(a, alo, ahi, b, blo, bhi)
+        if not anchors:
+            import difflib
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi])
+            for i, j, size in matcher.get_matching_blocks():
+                matches.extend((alo + i + k, blo + j + k) for k in range(size))
+            continue
+        for i, j in anchors:
+            matches.append((i, j))
+            stack.append((alo, i, blo, j))
+            alo, blo = i + 1, j + 1
+        stack.append((alo, ahi, blo, bhi))
+    matches.sort()
+    matches.append((len(a), len(b)))
+    
+    codes = []
+    i = j = 0
+    for ai, bj in matches:
+        if i < ai and j < bj:
+            codes.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            codes.append(("delete", i, ai, j, bj))
+        elif j < bj:
+            codes.append(("insert", i, ai, j, bj))
+        if ai < len(a):
+            # Extend the previous equal run when matches are consecutive
+            if codes and codes[-1][0] == "equal" and codes[-1][2] == ai and codes[-1][4] == bj:
+                codes[-1] = ("equal", codes[-1][1], ai + 1, codes[-1][3], bj + 1)
+            else:
+                codes.append(("equal", ai, ai + 1, bj, bj + 1))
+        i, j = ai + 1, bj + 1
+    return codes
+
+def _group_opcodes(codes, n):
+    """Split opcodes into hunks with n lines of context, like get_grouped_opcodes."""
+    if not codes:
+        codes = [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        # End the hunk inside equal runs too long to keep as context
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+def _diff_groups(a, b, n=3, algorithm="difflib"):
+    """Grouped opcodes for a and b using the named algorithm."""
+    if algorithm == "patience":
+        return _group_opcodes(_patience_opcodes(a, b), n)
+    return _grouped_opcodes(a, b, n)
+
+def unified_diff_lines(a, b, fromfile="", tofile="", n=3, algorithm="difflib"):
+    """Yield unified diff lines (no line terminators) for two lists of lines.
+    
+    Same output format as difflib.unified_diff. The default algorithm runs
+    difflib's SequenceMatcher over just the changed region. algorithm="patience"
+    anchors on lines unique to both sides instead, which keeps repeated lines
+    (blank lines, braces) from pulling matches out of place.
+    """
+    started = False
+    for group in _diff_groups(a, b, n, algorithm):
+        if not started:
+            started = True
+            yield f"--- {fromfile}"
+            yield f"+++ {tofile}"
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + line
+
+def _format_hunks(a, b, groups, fromfile, tofile, dim="", add="", delete="") -> str:
+    """Render grouped opcodes as unified diff text, one join per opcode.
+    
+    Each line is preceded by its color code (empty for plain output), the
+    way print_diff colors them.
+    """
+    parts = []
+    context, removed, added = f"\n{dim} ", f"\n{delete}-", f"\n{add}+"
+    for group in groups:
+        if not parts:
+            parts.append(f"{dim}--- {fromfile}\n{dim}+++ {tofile}")
+        first, last = group[0], group[-1]
+        parts.append(f"\n{dim}@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                if i1 < i2:
+                    parts.append(context + context.join(a[i1:i2]))
+                continue
+            if i1 < i2:
+                parts.append(removed + removed.join(a[i1:i2]))
+            if j1 < j2:
+                parts.append(added + added.join(b[j1:j2]))
+    if parts:
+        parts.append("\n")
+    return "".join(parts)
+
 
+# print_diff leaves hunk headers dim, unlike color_diff; codes are pre-encoded
+# so the output is assembled as bytes
+_COLOR_BY_PREFIX = {"+": encode_output(_G), "-": encode_output(_R)}
+_DIM_B = encode_output(_DIM)
 
-def print_diff(from_text, to_text, filepath):
-    diff = difflib.unified_diff(
-        from_text.splitlines(),
-        to_text.splitlines(),
-        fromfile=filepath,
-        tofile=f"{filepath} (edited)",
-        lineterm=""
+def _render_diff(from_text, to_text, filepath, algorithm="patience", color=_COLOR,
+                 _colors=_COLOR_BY_PREFIX, _headers=_DIFF_HEADERS, _dim=_DIM_B) -> bytes:
+    """Build print_diff's output as encoded bytes."""
+    tofile = f"{filepath} (edited)"
+    native = _native_diff_backend() if algorithm != "patience" else None
+    if native is None:
+        # Our own opcodes are formatted a block at a time rather than line by line
+        a, b = from_text.splitlines(), to_text.splitlines()
+        groups = _diff_groups(a, b, 3, "patience" if algorithm == "patience" else "difflib")
+        if color:
+            return encode_output(_format_hunks(a, b, groups, filepath, tofile, _DIM, _G, _R))
+        return encode_output(_format_hunks(a, b, groups, filepath, tofile))
+    
+    # Newer difflib_rs releases split the texts natively, skipping two Python line lists
+    unified_diff_str = getattr(native, "unified_diff_str", None)
+    if unified_diff_str is not None:
+        diff = unified_diff_str(from_text, to_text, fromfile=filepath, tofile=tofile, keepends=False)
+    else:
+        diff = native.unified_diff(from_text.splitlines(), to_text.splitlines(),
+                                   fromfile=filepath, tofile=tofile, lineterm="")
+    if not color:
+        return encode_output("".join([line + "\n" for line in diff]))
+    # Assemble the whole diff as bytes so it can be written once instead of a print() per line
+    buf = bytearray()
+    encoding = STDOUT_ENCODING
+    for line in diff:
+        buf += _dim if line[:3] in _headers else _colors.get(line[:1], _dim)
+        buf += line.encode(encoding, errors="replace")
+        buf += b"\n"
+    return bytes(buf)
+
+def _render_diff_job(job) -> bytes:
+    return _render_diff(*job)
+
+def print_diff(from_text, to_text, filepath, algorithm="patience"):
+    emit(_render_diff(from_text, to_text, filepath, algorithm))
+
+def print_diffs(pairs, algorithm="patience", max_workers=None):
+    """print_diff for many (from_text, to_text, filepath) triples, rendered in parallel.
+    
+    Each diff is rendered to bytes in a worker process and written in input
+    order, so output is identical to calling print_diff on each pair.
+    """
+    jobs = [(from_text, to_text, filepath, algorithm, _COLOR) for from_text, to_text, filepath in pairs]
+    if len(jobs) < 2:
+        for job in jobs:
+            emit(_render_diff_job(job))
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for output in executor.map(_render_diff_job, jobs):
+            emit(output)
+
+_COLOR_BY_PREFIX_BYTES = {prefix.encode(): code for prefix, code in _COLOR_BY_PREFIX.items()}
+_DIFF_HEADERS_BYTES = tuple(header.encode() for header in _DIFF_HEADERS)
+
+def print_diff_bytes(from_bytes: bytes, to_bytes: bytes, filepath: str,
+                     _colors=_COLOR_BY_PREFIX_BYTES, _headers=_DIFF_HEADERS_BYTES, _dim=_DIM_B):
+    """print_diff for raw file contents: diffs bytes lines without decoding them."""
+    import difflib
+    fromfile = filepath.encode(STDOUT_ENCODING, errors="replace")
+    diff = difflib.diff_bytes(
+        difflib.unified_diff,
+        from_bytes.splitlines(),
+        to_bytes.splitlines(),
+        fromfile=fromfile,
+        tofile=fromfile + b" (edited)",
+        lineterm=b""
     )
+    if not _COLOR:
+        emit(b"".join([line + b"\n" for line in diff]))
+        return
+    buf = bytearray()
     for line in diff:
-        if line.startswith("+") and not line.startswith("+++"):
-            print(Fore.GREEN + line)
-        elif line.startswith("-") and not line.startswith("---"):
-            print(Fore.RED + line)
-        else:
-            print(Style.DIM + line)
+        buf += _dim if line[:3] in _headers else _colors.get(line[:1], _dim)
+        buf += line
+        buf += b"\n"
+    emit(bytes(buf))
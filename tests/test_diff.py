@@ -0,0 +1,88 @@
+import difflib
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils import _group_opcodes, unified_diff_lines
+
+
+def apply_unified_diff(a, diff_lines):
+    """Apply unified diff lines to a, checking every context and removed line."""
+    out, pos = [], 0
+    for line in diff_lines[2:]:
+        if line.startswith("@@"):
+            old_range = line.split()[1][1:].split(",")
+            start = int(old_range[0])
+            # A zero-length range names the line before the hunk
+            if len(old_range) == 1 or old_range[1] != "0":
+                start -= 1
+            out.extend(a[pos:start])
+            pos = start
+        elif line[0] == " ":
+            assert a[pos] == line[1:]
+            out.append(line[1:])
+            pos += 1
+        elif line[0] == "-":
+            assert a[pos] == line[1:]
+            pos += 1
+        else:
+            out.append(line[1:])
+    return out + a[pos:]
+
+
+def random_edit(rng, a):
+    b = list(a)
+    for _ in range(rng.randint(0, 6)):
+        k = rng.randint(0, len(b))
+        op = rng.random()
+        if op < 0.4:
+            b.insert(k, rng.choice("abcxyz"))
+        elif b and op < 0.8:
+            del b[min(k, len(b) - 1)]
+        elif b:
+            b[min(k, len(b) - 1)] = "q"
+    return b
+
+
+class TestUnifiedDiffLines(unittest.TestCase):
+    def test_random_edits_apply(self):
+        rng = random.Random(0)
+        for algorithm in ("difflib", "patience"):
+            for _ in range(1000):
+                a = [rng.choice("abcdefghijklmnop") for _ in range(rng.randint(0, 60))]
+                b = random_edit(rng, a)
+                diff = list(unified_diff_lines(a, b, "x", "y", algorithm=algorithm))
+                self.assertEqual(bool(diff), a != b)
+                self.assertEqual(apply_unified_diff(a, diff), b)
+
+    def test_simple_cases_match_difflib(self):
+        cases = [
+            ([], ["one"]),
+            (["one"], []),
+            (["one", "two", "three"], ["one", "2", "three"]),
+            ([f"line {i}" for i in range(20)], [f"line {i}" for i in range(20) if i != 10]),
+            ([f"line {i}" for i in range(30)], [f"line {i}" for i in range(30)] + ["tail"]),
+            (["head"] + [f"line {i}" for i in range(30)], [f"line {i}" for i in range(30)]),
+        ]
+        for a, b in cases:
+            expected = list(difflib.unified_diff(a, b, "x", "y", lineterm=""))
+            for algorithm in ("difflib", "patience"):
+                self.assertEqual(list(unified_diff_lines(a, b, "x", "y", algorithm=algorithm)), expected)
+
+    def test_group_opcodes_matches_sequence_matcher(self):
+        rng = random.Random(1)
+        for _ in range(500):
+            a = [rng.choice("abcdefgh") for _ in range(rng.randint(0, 50))]
+            b = random_edit(rng, a)
+            for n in (0, 1, 3):
+                # Both sides trim the opcode list in place, so use separate matchers
+                codes = difflib.SequenceMatcher(None, a, b).get_opcodes()
+                expected = difflib.SequenceMatcher(None, a, b).get_grouped_opcodes(n)
+                self.assertEqual(list(_group_opcodes(codes, n)), list(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()